@@ -1,18 +1,214 @@
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime, UTC
+from collections import OrderedDict
+from hashlib import blake2b
 import uuid
-import yaml
+import orjson
+import xxhash
 import logging
-from neo4j import GraphDatabase
-import psycopg2
-from azure.search.documents import SearchClient
-from azure.keyvault.keys import KeyClient
-from azure.core.credentials import AzureKeyCredential
+import asyncio
+from functools import lru_cache
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-@dataclass
+# torch, sentence_transformers, asyncpg, numba, neo4j, hnswlib and the Azure SDKs are
+# imported where they are first needed so importing this module (e.g. for Clause) stays cheap
+if TYPE_CHECKING:
+    import asyncpg
+    from sentence_transformers import SentenceTransformer
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_CACHE_SIZE = 4096
+# Findings with cosine similarity above this are treated as duplicates
+FINDING_SIMILARITY_THRESHOLD = 0.95
+# Above this many findings, dedup uses an HNSW index instead of the full similarity matrix
+HNSW_DEDUP_MIN_FINDINGS = 1000
+# Azure Cognitive Search accepts at most 1000 documents per upload request
+SEARCH_UPLOAD_BATCH_SIZE = 1000
+# all-MiniLM-L6-v2 truncates inputs at 256 tokens (max_seq_length), not the tokenizer's 512
+EMBEDDING_MAX_SEQ_LENGTH = 256
+
+class _OnnxSentenceEncoder:
+    """ONNX Runtime implementation of the SentenceTransformer encode() interface.
+
+    Runs an exported (optionally int8-quantized) MiniLM graph on CPU with mean
+    pooling, matching the output of the sentence-transformers model. Export with:
+
+        optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \
+            --task feature-extraction onnx/
+
+    Attributes:
+        tokenizer: HuggingFace tokenizer producing numpy inputs
+        session: ONNX Runtime inference session
+        max_seq_length: Token limit inputs are truncated to, as in sentence-transformers
+    """
+
+    def __init__(self, model_dir: str, model_file: str = "model.onnx") -> None:
+        """Load the tokenizer and ONNX graph from an exported model directory.
+
+        Args:
+            model_dir: Directory produced by the optimum ONNX export
+            model_file: ONNX graph file name inside model_dir
+        """
+        import os
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        # Same truncation as the torch backend, so both produce the same embeddings
+        self.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+        config_path = os.path.join(model_dir, "sentence_bert_config.json")
+        if os.path.exists(config_path):
+            with open(config_path, "rb") as f:
+                self.max_seq_length = orjson.loads(f.read()).get("max_seq_length", self.max_seq_length)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self,
+               sentences: Union[str, List[str]],
+               batch_size: int = 32,
+               show_progress_bar: bool = False,
+               convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode sentences into embeddings.
+
+        Args:
+            sentences: Single sentence or list of sentences
+            batch_size: Number of sentences per inference call
+            show_progress_bar: Accepted for interface compatibility; ignored
+            convert_to_numpy: Accepted for interface compatibility; output is always numpy
+            normalize_embeddings: Whether to L2-normalize each embedding
+
+        Returns:
+            Embedding vector for a single sentence, or matrix with one row per sentence
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feed = {k: v for k, v in inputs.items() if k in self._input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        embeddings = np.vstack(batches).astype(np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+# Shared across all AcquisitionClauseManager instances, one per backend; loaded on first use
+_MODELS: Dict[str, Union["SentenceTransformer", _OnnxSentenceEncoder]] = {}
+
+def _get_model(backend: str = "torch",
+               onnx_model_dir: str = "onnx/",
+               onnx_model_file: str = "model.onnx") -> Union["SentenceTransformer", _OnnxSentenceEncoder]:
+    """Return the process-wide embedding model for a backend, loading it on first call.
+
+    Args:
+        backend: "torch" for sentence-transformers or "onnx" for ONNX Runtime
+        onnx_model_dir: Exported model directory, used by the onnx backend
+        onnx_model_file: ONNX graph file name, e.g. an int8-quantized export
+
+    Returns:
+        Shared model exposing encode()
+    """
+    model = _MODELS.get(backend)
+    if model is not None:
+        return model
+
+    if backend == "onnx":
+        model = _OnnxSentenceEncoder(onnx_model_dir, onnx_model_file)
+    elif backend == "torch":
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if torch.cuda.is_available():
+            # MiniLM is robust to half precision; fp16 doubles tensor-core throughput
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, device='cuda').half()
+        else:
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, device='cpu')
+    else:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    _MODELS[backend] = model
+    return model
+
+def _content_hash(content: str, modulus: int) -> int:
+    """Hash text content for persistent identifiers.
+
+    Depends only on the UTF-8 text, so unlike embedding-derived hashes it is
+    identical across processes, hosts, fp16/fp32 models and BLAS builds.
+
+    Args:
+        content: Text content to hash
+        modulus: Upper bound (exclusive) of the returned value
+
+    Returns:
+        Non-negative integer in [0, modulus)
+    """
+    return int.from_bytes(blake2b(content.encode(), digest_size=8).digest(), 'big') % modulus
+
+def _recommendation_key(rec: Union[str, Dict]) -> int:
+    """Return a compact hash key identifying a recommendation by content.
+
+    Args:
+        rec: Recommendation text or structured recommendation
+
+    Returns:
+        64-bit hash of the canonical JSON encoding of the recommendation
+    """
+    # default=str keeps sets and other non-JSON values from raising; numpy
+    # scalars and arrays are serialized natively
+    return xxhash.xxh3_64(
+        orjson.dumps(
+            rec,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    ).intdigest()
+
+def _dedup_mask(similarity: np.ndarray, threshold: float) -> np.ndarray:
+    """Mark rows that are not above threshold similarity to any earlier kept row.
+
+    Args:
+        similarity: Square pairwise cosine similarity matrix
+        threshold: Similarity above which two rows are duplicates
+
+    Returns:
+        Boolean keep mask, one entry per row
+    """
+    n = similarity.shape[0]
+    keep = np.ones(n, np.bool_)
+    for i in range(n):
+        for j in range(i):
+            if keep[j] and similarity[i, j] > threshold:
+                keep[i] = False
+                break
+    return keep
+
+@lru_cache(maxsize=1)
+def _dedup_mask_kernel():
+    """Return _dedup_mask compiled with Numba, importing numba on first use."""
+    from numba import njit
+
+    return njit(cache=True, fastmath=True)(_dedup_mask)
+
+@dataclass(slots=True)
 class Clause:
     """Represents an acquisition clause with its metadata and analysis.
     
@@ -57,13 +253,38 @@ class AcquisitionClauseManager:
     Attributes:
         config: Configuration dictionary for services and connections
         logger: Logging instance for error tracking
-        model: SentenceTransformer model for text embeddings
-        pg_conn: PostgreSQL database connection
+        model: Shared text embedding model (sentence-transformers or ONNX Runtime)
+        _embedding_cache: LRU cache of content embeddings keyed by content hash
+        pg_pool: PostgreSQL connection pool, created on first use
         graph_db: Neo4j graph database connection
         search_client: Azure Cognitive Search client
         key_client: Azure Key Vault client
     """
 
+    _PERSONAS: Dict[str, Dict] = {
+        "legal": {
+            "model": "gpt-4o",
+            "temperature": 0.3,
+            "system_prompt": "You are a legal expert analyzing acquisition clauses."
+        },
+        "technical": {
+            "model": "gpt-4o",
+            "temperature": 0.2,
+            "system_prompt": "You are a technical expert analyzing implementation details."
+        },
+        "compliance": {
+            "model": "gpt-4o",
+            "temperature": 0.1,
+            "system_prompt": "You are a compliance expert verifying regulatory adherence."
+        }
+    }
+
+    _DEFAULT_PERSONA: Dict = {
+        "model": "gpt-4o",
+        "temperature": 0.5,
+        "system_prompt": "You are an AI assistant analyzing acquisition clauses."
+    }
+
     def __init__(self, config: Dict) -> None:
         """Initialize the AcquisitionClauseManager.
         
@@ -73,7 +294,16 @@ class AcquisitionClauseManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self._init_connections(config)
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self._embedding_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+    @property
+    def model(self) -> Union["SentenceTransformer", _OnnxSentenceEncoder]:
+        """Shared embedding model for the configured backend, loaded on first access."""
+        return _get_model(
+            self.config.get("embedding_backend", "torch"),
+            self.config.get("onnx_model_dir", "onnx/"),
+            self.config.get("onnx_model_file", "model.onnx")
+        )
 
     def _init_connections(self, config: Dict) -> None:
         """Initialize database and service connections.
@@ -81,7 +311,14 @@ class AcquisitionClauseManager:
         Args:
             config: Dictionary containing connection parameters for all services
         """
-        self.pg_conn = psycopg2.connect(**config["postgresql"])
+        from neo4j import GraphDatabase
+        from azure.core.credentials import AzureKeyCredential
+        from azure.keyvault.keys import KeyClient
+        from azure.search.documents.aio import SearchClient
+
+        # asyncpg pools must be created inside a running loop; see _get_pg_pool
+        self.pg_pool: Optional["asyncpg.Pool"] = None
+        self._pg_pool_lock = asyncio.Lock()
         self.graph_db = GraphDatabase.driver(**config["neo4j"])
         
         self.search_client = SearchClient(
@@ -95,6 +332,49 @@ class AcquisitionClauseManager:
             credential=AzureKeyCredential(config["keyvault_key"])
         )
 
+    def _encode_cached(self, content: str) -> np.ndarray:
+        """Encode content to a unit-normalized embedding, reusing recent results.
+        
+        Args:
+            content: Text content to encode
+            
+        Returns:
+            Embedding vector for the content
+        """
+        key = blake2b(content.encode(), digest_size=16).digest()
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            self._embedding_cache.move_to_end(key)
+            return embedding
+
+        # Normalized vectors keep coordinate components in [-1, 1]
+        embedding = self.model.encode(
+            content,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        self._embedding_cache[key] = embedding
+        if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+        return embedding
+
+    async def _get_pg_pool(self) -> "asyncpg.Pool":
+        """Return the PostgreSQL connection pool, creating it on first use.
+        
+        Returns:
+            Shared asyncpg connection pool
+        """
+        async with self._pg_pool_lock:
+            if self.pg_pool is None:
+                import asyncpg
+
+                self.pg_pool = await asyncpg.create_pool(
+                    **self.config["postgresql"],
+                    min_size=4,
+                    max_size=16
+                )
+        return self.pg_pool
+
     async def _store_entry(self, entry: Dict) -> None:
         """Store entry data in PostgreSQL database.
         
@@ -105,26 +385,77 @@ class AcquisitionClauseManager:
             Exception: If database operation fails
         """
         try:
-            with self.pg_conn.cursor() as cur:
-                cur.execute(
+            pool = await self._get_pg_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(
                     """
                     INSERT INTO entries (
                         entry_id, title, content, metadata, 
                         created_at, updated_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    ) VALUES ($1, $2, $3, $4::jsonb, now(), now())
                     """,
-                    (
-                        entry["id"],
-                        entry["title"],
-                        entry["content"],
-                        yaml.dump(entry["metadata"]),
-                        datetime.now(UTC),
-                        datetime.now(UTC)
-                    )
+                    entry["id"],
+                    entry["title"],
+                    entry["content"],
+                    orjson.dumps(entry["metadata"]).decode()
                 )
-                self.pg_conn.commit()
         except Exception as e:
-            self.pg_conn.rollback()
+            self.logger.error(f"Failed to store entry: {str(e)}")
+            raise
+
+    async def _store_entries_bulk(self, entries: List[Dict]) -> None:
+        """Store multiple entries in PostgreSQL using a single COPY.
+        
+        Rows are copied into a transaction-scoped staging table and inserted
+        from there so created_at/updated_at come from the server's now(),
+        exactly as in _store_entry.
+        
+        Args:
+            entries: List of dictionaries containing entry data to store
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        if not entries:
+            return
+
+        rows = [
+            (
+                entry["id"],
+                entry["title"],
+                entry["content"],
+                orjson.dumps(entry["metadata"]).decode()
+            )
+            for entry in entries
+        ]
+        try:
+            pool = await self._get_pg_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        CREATE TEMP TABLE entries_staging ON COMMIT DROP AS
+                        SELECT entry_id, title, content, metadata
+                        FROM entries WITH NO DATA
+                        """
+                    )
+                    await conn.copy_records_to_table(
+                        "entries_staging",
+                        records=rows,
+                        columns=["entry_id", "title", "content", "metadata"]
+                    )
+                    await conn.execute(
+                        """
+                        INSERT INTO entries (
+                            entry_id, title, content, metadata,
+                            created_at, updated_at
+                        )
+                        SELECT entry_id, title, content, metadata, now(), now()
+                        FROM entries_staging
+                        """
+                    )
+        except Exception as e:
+            self.logger.error(f"Failed to store entries: {str(e)}")
             raise
 
     async def _index_entry(self, entry: Dict) -> None:
@@ -137,7 +468,7 @@ class AcquisitionClauseManager:
             Exception: If indexing operation fails
         """
         try:
-            embedding = self.model.encode(entry["content"])
+            embedding = self._encode_cached(entry["content"])
             
             search_entry = {
                 "id": entry["id"],
@@ -154,6 +485,51 @@ class AcquisitionClauseManager:
             self.logger.error(f"Failed to index entry: {str(e)}")
             raise
 
+    async def _index_entries_bulk(self, entries: List[Dict]) -> None:
+        """Index multiple entries in Azure Cognitive Search.
+        
+        Contents are encoded in one batched call and uploaded in as few
+        requests as the service allows.
+        
+        Args:
+            entries: List of dictionaries containing entry data to index
+            
+        Raises:
+            Exception: If indexing operation fails
+        """
+        if not entries:
+            return
+
+        try:
+            embeddings = self.model.encode(
+                [entry["content"] for entry in entries],
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+
+            search_entries = [
+                {
+                    "id": entry["id"],
+                    "title": entry["title"],
+                    "content": entry["content"],
+                    "metadata": entry["metadata"],
+                    "vector": embedding.tolist(),
+                    "@search.action": "upload"
+                }
+                for entry, embedding in zip(entries, embeddings)
+            ]
+
+            for start in range(0, len(search_entries), SEARCH_UPLOAD_BATCH_SIZE):
+                await self.search_client.upload_documents(
+                    search_entries[start:start + SEARCH_UPLOAD_BATCH_SIZE]
+                )
+
+        except Exception as e:
+            self.logger.error(f"Failed to index entries: {str(e)}")
+            raise
+
     def _generate_identifier(self, content: str, prefix: str, hash_length: int = 4) -> str:
         """Generate identifier (Nuremberg number or SAM tag) from content.
         
@@ -169,8 +545,7 @@ class AcquisitionClauseManager:
             Exception: If identifier generation fails
         """
         try:
-            embedding = self.model.encode(content)
-            hash_value = hash(str(embedding[:5].tolist())) % (10 ** hash_length)
+            hash_value = _content_hash(content, 10 ** hash_length)
             return f"{prefix}-{hash_value:0{hash_length}d}"
         except Exception as e:
             self.logger.error(f"Failed to generate {prefix} identifier: {str(e)}")
@@ -202,7 +577,7 @@ class AcquisitionClauseManager:
         try:
             domain_prefix = clause_data["domain"][:3].upper()
             level_component = f"L{clause_data['level']}"
-            content_hash = hash(str(self.model.encode(clause_data["content"])[:3].tolist())) % 1000
+            content_hash = _content_hash(clause_data["content"], 1000)
             return f"{domain_prefix}-{level_component}-{content_hash:03d}"
         except Exception as e:
             self.logger.error(f"Failed to generate SAM tag: {str(e)}")
@@ -221,8 +596,9 @@ class AcquisitionClauseManager:
             Exception: If coordinate generation fails
         """
         try:
-            embedding = self.model.encode(content)
-            return (int(embedding[0] * 100), int(embedding[1] * 100))
+            embedding = self._encode_cached(content)
+            # Components lie in [-1, 1] after normalization
+            return (int(embedding[0] * 10000), int(embedding[1] * 10000))
         except Exception as e:
             self.logger.error(f"Failed to generate coordinates: {str(e)}")
             raise
@@ -236,28 +612,7 @@ class AcquisitionClauseManager:
         Returns:
             Dictionary containing persona configuration
         """
-        personas = {
-            "legal": {
-                "model": "gpt-4o",
-                "temperature": 0.3,
-                "system_prompt": "You are a legal expert analyzing acquisition clauses."
-            },
-            "technical": {
-                "model": "gpt-4o",
-                "temperature": 0.2,
-                "system_prompt": "You are a technical expert analyzing implementation details."
-            },
-            "compliance": {
-                "model": "gpt-4o",
-                "temperature": 0.1,
-                "system_prompt": "You are a compliance expert verifying regulatory adherence."
-            }
-        }
-        return personas.get(role, {
-            "model": "gpt-4o",
-            "temperature": 0.5,
-            "system_prompt": "You are an AI assistant analyzing acquisition clauses."
-        })
+        return self._PERSONAS.get(role, self._DEFAULT_PERSONA)
 
     async def _reconcile_analysis_results(self, results: List[Dict]) -> Dict:
         """Reconcile analysis results from multiple AI personas.
@@ -272,13 +627,24 @@ class AcquisitionClauseManager:
             Exception: If reconciliation fails
         """
         try:
-            findings = self._process_findings(results)
-            avg_confidence = self._calculate_confidence(results)
-            recommendations = self._deduplicate_recommendations(results)
-            
+            # Collect findings, confidence and recommendations in a single pass
+            all_findings = []
+            confidence_sum = 0.0
+            seen_recommendations = set()
+            recommendations = []
+
+            for result in results:
+                confidence_sum += result.get("confidence", 0)
+                all_findings.extend(result.get("findings", []))
+                for rec in result.get("recommendations", []):
+                    rec_key = _recommendation_key(rec)
+                    if rec_key not in seen_recommendations:
+                        recommendations.append(rec)
+                        seen_recommendations.add(rec_key)
+
             return {
-                "findings": findings,
-                "confidence": avg_confidence,
+                "findings": self._process_findings(all_findings),
+                "confidence": confidence_sum / len(results),
                 "recommendations": recommendations,
                 "timestamp": datetime.now(UTC).isoformat()
             }
@@ -286,57 +652,74 @@ class AcquisitionClauseManager:
             self.logger.error(f"Failed to reconcile analysis: {str(e)}")
             raise
 
-    def _process_findings(self, results: List[Dict]) -> List[Dict]:
-        """Process and deduplicate findings from analysis results.
+    def _process_findings(self, all_findings: List[Dict]) -> List[Dict]:
+        """Embed and deduplicate findings gathered from analysis results.
         
         Args:
-            results: List of analysis results containing findings
+            all_findings: Findings from all analysis results, in result order
             
         Returns:
             List of deduplicated findings
         """
-        findings = []
-        seen_embeddings = set()
-        
-        for result in results:
-            for finding in result.get("findings", []):
-                finding["embedding"] = self.model.encode(finding["text"])
-                embedding_key = tuple(finding["embedding"].round(2))
-                if embedding_key not in seen_embeddings:
-                    findings.append(finding)
-                    seen_embeddings.add(embedding_key)
-        
-        return findings
+        if not all_findings:
+            return []
+
+        # Encode every finding in one batched call instead of one call per finding
+        embeddings = self.model.encode(
+            [finding["text"] for finding in all_findings],
+            batch_size=64,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(all_findings) >= HNSW_DEDUP_MIN_FINDINGS:
+            keep = self._dedup_mask_hnsw(embeddings)
+        else:
+            keep = self._dedup_mask_dense(embeddings)
 
-    def _calculate_confidence(self, results: List[Dict]) -> float:
-        """Calculate average confidence score from results.
+        for i, finding in enumerate(all_findings):
+            finding["embedding"] = embeddings[i]
+
+        return [finding for i, finding in enumerate(all_findings) if keep[i]]
+
+    def _dedup_mask_dense(self, embeddings: np.ndarray) -> np.ndarray:
+        """Mark findings to keep using the full pairwise similarity matrix.
         
         Args:
-            results: List of analysis results containing confidence scores
+            embeddings: Unit-normalized finding embeddings, one row per finding
             
         Returns:
-            Average confidence score
+            Boolean mask of findings that are not near-duplicates of an earlier one
         """
-        confidence_scores = [result.get("confidence", 0) for result in results]
-        return sum(confidence_scores) / len(confidence_scores)
+        # Embeddings are unit-normalized, so the Gram matrix holds cosine similarities
+        similarity = embeddings @ embeddings.T
+        return _dedup_mask_kernel()(similarity, FINDING_SIMILARITY_THRESHOLD)
 
-    def _deduplicate_recommendations(self, results: List[Dict]) -> List[str]:
-        """Deduplicate recommendations from results.
+    def _dedup_mask_hnsw(self, embeddings: np.ndarray) -> np.ndarray:
+        """Mark findings to keep using an approximate nearest-neighbour index.
+        
+        Avoids materializing the N x N similarity matrix for large result sets.
         
         Args:
-            results: List of analysis results containing recommendations
+            embeddings: Unit-normalized finding embeddings, one row per finding
             
         Returns:
-            List of deduplicated recommendations
+            Boolean mask of findings that are not near-duplicates of an earlier one
         """
-        seen_recommendations = set()
-        recommendations = []
-        
-        for result in results:
-            for rec in result.get("recommendations", []):
-                rec_text = str(rec)
-                if rec_text not in seen_recommendations:
-                    recommendations.append(rec)
-                    seen_recommendations.add(rec_text)
-        
-        return recommendations
\ No newline at end of file
+        import hnswlib
+
+        index = hnswlib.Index(space='cosine', dim=embeddings.shape[1])
+        index.init_index(max_elements=len(embeddings), ef_construction=100, M=16)
+        max_distance = 1.0 - FINDING_SIMILARITY_THRESHOLD
+
+        keep = np.zeros(len(embeddings), dtype=bool)
+        for i, vector in enumerate(embeddings):
+            if index.get_current_count() > 0:
+                _, distances = index.knn_query(vector, k=1)
+                if distances[0][0] < max_distance:
+                    continue
+            index.add_items(vector, i)
+            keep[i] = True
+        return keep
@@ -34,22 +34,24 @@ Example:
     )
 """
 
-from typing import Dict, List, Optional, Union, Tuple
+from typing import ClassVar, Dict, List, Optional, Union, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import numpy as np
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import networkx as nx
+import orjson
+import ahocorasick
 from datetime import datetime
 import logging
 import asyncio
+import importlib
+import inspect
+import os
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from collections import defaultdict
 import plotly.graph_objects as go
-import plotly.express as px
-from matplotlib import pyplot as plt
-import seaborn as sns
-import traceback
+import plotly.io as pio
 import sys
 from space_mapper import SpaceMapper
 from backend.rag.query_engine import QueryEngine
@@ -79,17 +81,18 @@ class ProcessingError(Exception):
     """Raised when query processing fails"""
     pass
 
+# Serialize figures with orjson so NumPy-backed traces skip per-element encoding
+pio.json.config.default_engine = "orjson"
+
 # Model configuration
 NLP_CONFIG = {
     "nlu_model": {
         "name": "roberta-base",
-        "max_length": 512,
-        "device": "cuda" if torch.cuda.is_available() else "cpu"
+        "max_length": 512
     },
     "semantic_model": {
         "name": "sentence-transformers/all-mpnet-base-v2", 
-        "max_length": 384,
-        "device": "cuda" if torch.cuda.is_available() else "cpu"
+        "max_length": 384
     }
 }
 
@@ -122,25 +125,31 @@ PERSONA_CONFIG = {
     }
 }
 
-# Visualization configuration
+# Early-exit criteria for multi-persona analysis
+CONSENSUS_CONFIG = {
+    "min_personas": 2,
+    "variance_threshold": 0.01
+}
+
+# Visualization configuration; chart_types are frozensets for O(1) membership checks
 VIZ_CONFIG = {
     "expert": {
         "detail_level": "high",
-        "chart_types": ["network", "tree", "heatmap", "scatter"],
+        "chart_types": frozenset({"network", "tree", "heatmap", "scatter"}),
         "include_technical": True
     },
     "intermediate": {        "detail_level": "medium", 
-        "chart_types": ["tree", "bar", "line"],
+        "chart_types": frozenset({"tree", "bar", "line"}),
         "include_technical": False
     },
     "beginner": {
         "detail_level": "low",
-        "chart_types": ["bar", "pie"],
+        "chart_types": frozenset({"bar", "pie"}),
         "include_technical": False
     }
 }
 
-@dataclass
+@dataclass(slots=True)
 class ExplanationNode:
     step: str
     reasoning: str
@@ -150,6 +159,88 @@ class ExplanationNode:
     persona_weights: Optional[Dict[str, float]] = None
     visualizations: Optional[List[Dict]] = None
 
+def _json_default(obj):
+    """Fallback encoder for values orjson does not serialize natively"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _numeric_values(values) -> Optional[np.ndarray]:
+    """Return trace coordinates as a 1-D float64 array, or None if missing or non-numeric"""
+    if values is None:
+        return None
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    return array.astype(np.float64)
+
+def _has_per_point_values(style) -> bool:
+    """Check whether trace properties hold arrays (per-point text, sizes, colors, ...)"""
+    if isinstance(style, dict):
+        return any(_has_per_point_values(value) for value in style.values())
+    return isinstance(style, (list, tuple, np.ndarray))
+
+def _merge_line_traces(traces: List) -> List:
+    """Fold plotly line traces with identical styling into one Scatter trace per style.
+
+    Only Scatter traces with an explicit line mode, explicit name and color,
+    numeric x and y and no per-point properties are merged, with NaN gaps
+    between segments; each merged trace takes the position of the first trace
+    in its group. Everything else, including traces relying on the default
+    colorway and y-only, categorical and date traces, is passed through unchanged.
+    """
+    groups: Dict[bytes, List[int]] = defaultdict(list)
+    coordinates: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    styles: Dict[bytes, Dict] = {}
+    for i, trace in enumerate(traces):
+        if not isinstance(trace, go.Scatter) or trace.mode is None or "lines" not in trace.mode:
+            continue
+        if trace.name is None or trace.line.color is None:
+            continue
+        if "markers" in trace.mode and trace.marker.color is None:
+            continue
+        x, y = _numeric_values(trace.x), _numeric_values(trace.y)
+        if x is None or y is None or x.size != y.size:
+            continue
+        style = trace.to_plotly_json()
+        for key in ("type", "x", "y"):
+            style.pop(key, None)
+        if _has_per_point_values(style):
+            continue
+        key = orjson.dumps(style, default=str, option=orjson.OPT_SORT_KEYS)
+        groups[key].append(i)
+        styles[key] = style
+        coordinates[i] = (x, y)
+
+    merged = {}
+    skip = set()
+    gap = np.array([np.nan])
+    for key, members in groups.items():
+        if len(members) < 2:
+            continue
+        merged[members[0]] = go.Scatter(
+            styles[key],
+            x=np.concatenate([np.concatenate([coordinates[i][0], gap]) for i in members]),
+            y=np.concatenate([np.concatenate([coordinates[i][1], gap]) for i in members]),
+            connectgaps=False
+        )
+        skip.update(members[1:])
+    if not merged:
+        return traces
+    return [merged.get(i, trace) for i, trace in enumerate(traces) if i not in skip]
+
+# Persona classes resolved so far, shared by all PersonaManager instances
+PERSONA_REGISTRY: Dict[str, type] = {}
+
+def _get_persona_class(persona_type: str) -> type:
+    """Resolve the persona class for a persona type, importing its module once"""
+    persona_class = PERSONA_REGISTRY.get(persona_type)
+    if persona_class is None:
+        module = importlib.import_module(f"persona.{persona_type}")
+        persona_class = getattr(module, f"{persona_type.capitalize()}Persona")
+        PERSONA_REGISTRY[persona_type] = persona_class
+    return persona_class
+
 class ReasoningType(Enum):
     DEDUCTIVE = "deductive"
     INDUCTIVE = "inductive"
@@ -157,13 +248,22 @@ class ReasoningType(Enum):
     ANALOGICAL = "analogical"
 
 class PersonaManager:
+    # Shared by all managers; only used for personas whose analyze() is synchronous
+    _EXECUTOR: ClassVar[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
     def __init__(self, config: Dict):
         self.personas = {}
         self.persona_scores = {}
+        self._persona_skills_lc: Dict[str, Tuple[str, ...]] = {}
+        self._consensus_weights: Dict[str, float] = {}
         self.config = config
         self.logger = logging.getLogger(__name__)
         self._initialize_personas()
-        self.executor = ThreadPoolExecutor(max_workers=len(PERSONA_CONFIG))
+        self._skill_automaton = self._build_skill_automaton()
+        # Guards lazy construction so concurrent first calls build one instance
+        self._persona_locks = {persona_type: asyncio.Lock() for persona_type in self.personas}
+        # Per-instance memo of persona scores keyed by normalized query and context
+        self._score_personas_cached = lru_cache(maxsize=8192)(self._compute_persona_scores)
 
     def _initialize_personas(self):
         """Initialize all available personas with their configurations"""
@@ -182,12 +282,19 @@ class PersonaManager:
                     "consensus_weight": settings["consensus_weight"]
                 }
                 self.persona_scores[persona_type] = 0.0
+                self._persona_skills_lc[persona_type] = tuple(s.lower() for s in settings["expertise"])
+                self._consensus_weights[persona_type] = settings["consensus_weight"]
+                # Resolve the persona class up front so first analyses skip the import
+                try:
+                    _get_persona_class(persona_type)
+                except (ImportError, AttributeError) as e:
+                    self.logger.warning("Deferring persona class load for %s: %s", persona_type, e)
             self.logger.info("Personas initialized successfully")
         except ConfigurationError as e:
-            self.logger.error(f"Configuration error during persona initialization: {str(e)}")
+            self.logger.error("Configuration error during persona initialization: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error during persona initialization: {str(e)}\n{traceback.format_exc()}")
+            self.logger.exception("Unexpected error during persona initialization: %s", e)
             raise ProcessingError(f"Failed to initialize personas: {str(e)}")
 
     async def analyze_with_personas(self, query: str, context: Dict) -> List[Dict]:
@@ -205,84 +312,137 @@ class PersonaManager:
                 self.logger.warning("No relevant personas found for query")
                 return []
 
-            analysis_tasks = []
-            for persona_type in relevant_personas:
-                task = self._analyze_with_persona(persona_type, query, context)
-                analysis_tasks.append(task)
-            
-            results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
-            
-            # Filter out any failed analyses
-            valid_results = [r for r in results if not isinstance(r, Exception)]
-            
-            if not valid_results:
+            async def run(persona_type: str) -> Tuple[str, Dict]:
+                return persona_type, await self._analyze_with_persona(persona_type, query, context)
+
+            analysis_tasks = [asyncio.create_task(run(p)) for p in relevant_personas]
+
+            # Consume results as they finish so a slow persona cannot hold up a
+            # response the faster personas already agree on
+            completed: List[Tuple[str, Dict]] = []
+            try:
+                for next_done in asyncio.as_completed(analysis_tasks,
+                                                      timeout=self.config.get("persona_timeout")):
+                    try:
+                        completed.append(await next_done)
+                    except asyncio.TimeoutError:
+                        # The overall deadline, not a persona failure; handled below
+                        raise
+                    except Exception as e:
+                        # Filter out any failed analyses
+                        self.logger.warning("Persona analysis failed: %s", e)
+                        continue
+                    if self._sufficient_consensus(completed, scores):
+                        break
+            except asyncio.TimeoutError:
+                self.logger.warning("Persona analysis timed out with %d of %d results",
+                                    len(completed), len(analysis_tasks))
+            finally:
+                for task in analysis_tasks:
+                    task.cancel()
+
+            if not completed:
                 raise ProcessingError("All persona analyses failed")
-                
-            return self._combine_persona_results(valid_results, scores)
+
+            return self._combine_persona_results(
+                [result for _, result in completed],
+                scores,
+                [persona_type for persona_type, _ in completed]
+            )
         except ValueError as e:
-            self.logger.error(f"Validation error in analyze_with_personas: {str(e)}")
+            self.logger.error("Validation error in analyze_with_personas: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error in analyze_with_personas: {str(e)}\n{traceback.format_exc()}")
+            self.logger.exception("Error in analyze_with_personas: %s", e)
             raise ProcessingError(f"Failed to analyze with personas: {str(e)}")
 
-    def _combine_persona_results(self, results: List[Dict], scores: Dict[str, float]) -> Dict:
-        """Combine and weigh results from multiple personas"""
+    def _sufficient_consensus(self, completed: List[Tuple[str, Dict]], scores: Dict[str, float]) -> bool:
+        """Check whether finished persona analyses already agree closely enough to stop"""
+        usable = [(p, r) for p, r in completed if "error" not in r]
+        if len(usable) < CONSENSUS_CONFIG["min_personas"]:
+            return False
+
+        confidences = np.array([r.get("confidence", 0.5) for _, r in usable], dtype=np.float64)
+        weights = np.array(
+            [self._consensus_weights[p] * scores[p] for p, _ in usable],
+            dtype=np.float64
+        )
+        if weights.sum() <= 0:
+            return False
+        mean = np.average(confidences, weights=weights)
+        return np.average((confidences - mean) ** 2, weights=weights) < CONSENSUS_CONFIG["variance_threshold"]
+
+    def _combine_persona_results(self,
+                                 results: List[Dict],
+                                 scores: Dict[str, float],
+                                 persona_types: List[str]) -> Dict:
+        """Combine and weigh results from multiple personas; persona_types[i] produced results[i]"""
         try:
             if not results:
                 raise ValueError("No results to combine")
 
-            combined_result = {
-                "analysis": "",
-                "confidence": 0.0,
-                "recommendations": [],
-                "next_steps": [],
-                "persona_contributions": {},
-                "visualizations": []
-            }
-
-            total_weight = sum(self.personas[p]["consensus_weight"] * scores[p] 
-                             for p in scores if scores[p] > 0.3)
+            weights = np.array(
+                [self._consensus_weights[p] * scores[p] for p in persona_types],
+                dtype=np.float64
+            )
+            total_weight = weights.sum()
 
             if total_weight == 0:
                 raise ValueError("Total weight cannot be zero")
 
-            for result, (persona_type, score) in zip(results, scores.items()):
-                if score <= 0.3:
-                    continue
-
-                weight = self.personas[persona_type]["consensus_weight"] * score / total_weight
-                combined_result["persona_contributions"][persona_type] = weight
+            weights /= total_weight
+            contributions = list(zip(persona_types, weights.tolist(), results))
+            confidences = np.array([r.get("confidence", 0.5) for r in results])
 
+            combined_result = {
                 # Weighted combination of analyses
-                combined_result["analysis"] += f"\n{weight:.2f} * {result['analysis']}"
-                combined_result["confidence"] += weight * result.get("confidence", 0.5)
-                
+                "analysis": "".join(
+                    f"\n{weight:.2f} * {result['analysis']}"
+                    for _, weight, result in contributions
+                ),
+                "confidence": float(weights @ confidences),
                 # Merge recommendations and next steps with weights
-                for rec in result.get("recommendations", []):
-                    combined_result["recommendations"].append({
-                        "content": rec,
-                        "weight": weight
-                    })
-                
-                for step in result.get("next_steps", []):
-                    combined_result["next_steps"].append({
-                        "content": step,
-                        "weight": weight
-                    })
-
+                "recommendations": self._weighted_items(contributions, "recommendations"),
+                "next_steps": self._weighted_items(contributions, "next_steps"),
+                "persona_contributions": {
+                    persona_type: weight for persona_type, weight, _ in contributions
+                },
                 # Merge visualizations if available
-                if "visualizations" in result:
-                    combined_result["visualizations"].extend(result["visualizations"])
+                "visualizations": _merge_line_traces(list(chain.from_iterable(
+                    result["visualizations"]
+                    for _, _, result in contributions
+                    if "visualizations" in result
+                )))
+            }
 
             return combined_result
         except ValueError as e:
-            self.logger.error(f"Validation error in _combine_persona_results: {str(e)}")
+            self.logger.error("Validation error in _combine_persona_results: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error combining persona results: {str(e)}\n{traceback.format_exc()}")
+            self.logger.exception("Error combining persona results: %s", e)
             raise ProcessingError(f"Failed to combine persona results: {str(e)}")
 
+    @staticmethod
+    def _weighted_items(contributions: List[Tuple[str, float, Dict]], key: str) -> Dict:
+        """Collect result[key] items across personas as parallel contents/weights columns.
+
+        Items proposed by several personas appear once, carrying the summed weight.
+        """
+        totals: Dict = defaultdict(float)
+        first_seen = {}
+        for _, weight, result in contributions:
+            for item in result.get(key, []):
+                item_key = item if isinstance(item, str) else orjson.dumps(
+                    item, default=_json_default, option=orjson.OPT_SORT_KEYS
+                )
+                first_seen.setdefault(item_key, item)
+                totals[item_key] += weight
+        return {
+            "contents": list(first_seen.values()),
+            "weights": np.fromiter(totals.values(), dtype=np.float32, count=len(totals))
+        }
+
     def score_personas(self, query: str, context: Dict) -> Dict[str, float]:
         """Score personas based on query relevance and context"""
         try:
@@ -291,44 +451,68 @@ class PersonaManager:
             if not isinstance(context, dict):
                 raise ValueError("Context must be a dictionary")
 
-            scores = {}
-            for persona_type, persona in self.personas.items():
-                expertise_match = sum(
-                    1 for skill in persona["config"]["expertise"] 
-                    if skill.lower() in query.lower()
-                )
-                context_match = sum(
-                    1 for skill in persona["config"]["expertise"]
-                    if any(skill.lower() in str(v).lower() for v in context.values())
-                )
-                scores[persona_type] = (expertise_match + context_match) / len(persona["config"]["expertise"])
+            context_items = tuple(sorted((str(k), str(v).lower()) for k, v in context.items()))
+            scores = dict(self._score_personas_cached(query.lower(), context_items))
             
-            self.logger.debug(f"Persona scores calculated: {scores}")
+            self.logger.debug("Persona scores calculated: %s", scores)
             return scores
         except ValueError as e:
-            self.logger.error(f"Validation error in score_personas: {str(e)}")
+            self.logger.error("Validation error in score_personas: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error scoring personas: {str(e)}\n{traceback.format_exc()}")
+            self.logger.exception("Error scoring personas: %s", e)
             raise ProcessingError(f"Failed to score personas: {str(e)}")
 
+    def _build_skill_automaton(self) -> "ahocorasick.Automaton":
+        """Build an Aho-Corasick automaton over the lowercased skills of all personas"""
+        automaton = ahocorasick.Automaton()
+        for skills_lc in self._persona_skills_lc.values():
+            for skill in skills_lc:
+                automaton.add_word(skill, skill)
+        automaton.make_automaton()
+        return automaton
+
+    def _compute_persona_scores(self,
+                                query_lc: str,
+                                context_items: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, float], ...]:
+        """Score personas against a lowercased query and normalized context items"""
+        context_lc = " ".join(v for _, v in context_items)
+        # One automaton pass per text finds every skill keyword at once
+        query_hits = {skill for _, skill in self._skill_automaton.iter(query_lc)}
+        context_hits = {skill for _, skill in self._skill_automaton.iter(context_lc)}
+        return tuple(
+            (
+                persona_type,
+                (sum(1 for skill in skills_lc if skill in query_hits) +
+                 sum(1 for skill in skills_lc if skill in context_hits)) / len(skills_lc)
+            )
+            for persona_type, skills_lc in self._persona_skills_lc.items()
+        )
+
     async def _analyze_with_persona(self, persona_type: str, query: str, context: Dict) -> Dict:
         """Execute analysis with a specific persona"""
         try:
-            if not self.personas[persona_type]["instance"]:
-                # Lazy load persona instance
-                module = __import__(f"persona.{persona_type}")
-                persona_class = getattr(module, f"{persona_type.capitalize()}Persona")
-                self.personas[persona_type]["instance"] = persona_class(self.config)
-
-            result = await self.personas[persona_type]["instance"].analyze(query, context)
+            async with self._persona_locks[persona_type]:
+                if self.personas[persona_type]["instance"] is None:
+                    # Lazy load persona instance
+                    persona_class = _get_persona_class(persona_type)
+                    self.personas[persona_type]["instance"] = persona_class(self.config)
+
+            instance = self.personas[persona_type]["instance"]
+            if inspect.iscoroutinefunction(instance.analyze):
+                result = await instance.analyze(query, context)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._EXECUTOR, partial(instance.analyze, query, context)
+                )
             self.personas[persona_type]["last_used"] = datetime.now()
             return result
         except ImportError as e:
-            self.logger.error(f"Failed to import persona module {persona_type}: {str(e)}")
+            self.logger.error("Failed to import persona module %s: %s", persona_type, e)
             raise ProcessingError(f"Persona module not found: {persona_type}")
         except Exception as e:
-            self.logger.error(f"Error in persona {persona_type}: {str(e)}\n{traceback.format_exc()}")
+            self.logger.exception("Error in persona %s: %s", persona_type, e)
             return {"error": str(e), "confidence": 0.0}
 
 class AdvancedAIEngine:
@@ -337,6 +521,19 @@ class AdvancedAIEngine:
         self.query_engine = QueryEngine(config)
         self.compliance_system = ComplianceSystem(config)
 
+    @staticmethod
+    def to_bytes(result: Dict) -> bytes:
+        """Serialize an analysis result to JSON bytes for the HTTP layer.
+
+        Encodes dataclasses (including ExplanationNode trees) and NumPy values
+        natively, so handlers can return the bytes without Starlette's encoder.
+        """
+        return orjson.dumps(
+            result,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
     async def analyze(self, query: str, expertise_level: int, embeddings: List[float]) -> Dict:
         # Map query to 4D space
         coordinates = await self.space_mapper.map_to_4d(query, embeddings)
@@ -389,19 +586,19 @@ class AdvancedAIEngine:
         }
 
     def _generate_recommendations(self, gaps: List[Dict], requirements: List[Dict]) -> List[Dict]:
-        recommendations = []
-        for gap in gaps:
-            relevant_reqs = [
-                req for req in requirements 
-                if req["category"] == gap["category"]
-            ]
-            recommendations.append({
+        # Index requirements by category once instead of rescanning them per gap
+        by_category = defaultdict(list)
+        for req in requirements:
+            by_category[req["category"]].append(req)
+        return [
+            {
                 "gap": gap["description"],
-                "requirements": relevant_reqs,
+                "requirements": list(by_category.get(gap["category"], ())),
                 "priority": gap["risk_level"],
                 "suggested_actions": gap["remediation_steps"]
-            })
-        return recommendations
+            }
+            for gap in gaps
+        ]
 
     def _generate_explanation_tree(self, query: str, coordinates: Dict, compliance: Dict) -> Dict:
         return {
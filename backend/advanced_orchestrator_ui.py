@@ -1,7 +1,30 @@
-from typing import Dict  
-from openai import AzureOpenAI 
+from typing import AsyncIterator, ClassVar, Dict  
+from collections import OrderedDict
+from hashlib import blake2b
+from operator import itemgetter
+import asyncio
+from functools import lru_cache
+from openai import AsyncAzureOpenAI
+import httpx
 import os
 
+
+@lru_cache(maxsize=1)
+def _get_client() -> AsyncAzureOpenAI:
+    """Return the process-wide Azure OpenAI client, creating it on first use.
+    
+    Sharing one client keeps a single keep-alive connection pool, so requests
+    from different orchestrators reuse established TLS connections.
+    """
+    return AsyncAzureOpenAI(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version="2024-08-01-preview",
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    )
+
 class AdvancedOrchestrator:
     """Advanced orchestrator for handling RAG-enhanced LLM responses.
     
@@ -9,16 +32,23 @@ class AdvancedOrchestrator:
     based on retrieved context from RAG results.
     
     Attributes:
-        ai_client: AzureOpenAI client instance for making API calls
+        ai_client: Shared AsyncAzureOpenAI client instance for making API calls
     """
 
+    SYSTEM_MSG: ClassVar[Dict[str, str]] = {
+        "role": "system", "content": "You are a regulatory compliance expert."
+    }
+
+    # Completed response texts keyed by request hash, shared across instances
+    RESPONSE_CACHE_SIZE: ClassVar[int] = 1024
+    _response_cache: ClassVar["OrderedDict[bytes, str]"] = OrderedDict()
+    # One lock per in-flight request so identical concurrent prompts hit Azure once
+    _inflight: ClassVar[Dict[bytes, asyncio.Lock]] = {}
+
     def __init__(self):
-        """Initialize the orchestrator with Azure OpenAI client."""
-        self.ai_client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            api_version="2024-08-01-preview",
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-        )
+        """Initialize the orchestrator with the shared Azure OpenAI client."""
+        self.ai_client = _get_client()
+        self._model = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
 
     async def generate_response(self, rag_result: Dict) -> Dict:
         """Generate an enhanced response using RAG results through Azure OpenAI.
@@ -44,25 +74,119 @@ class AdvancedOrchestrator:
             Exception: If LLM response generation fails
         """
         try:
-            response = await self.ai_client.chat.completions.create(
-                model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            temperature = 0.7
+            key = self._cache_key(
+                self._model, self.SYSTEM_MSG["content"], rag_result["prompt"], temperature
+            )
+
+            content = self._cached_response(key)
+            if content is None:
+                lock = self._inflight.setdefault(key, asyncio.Lock())
+                try:
+                    async with lock:
+                        # A concurrent identical request may have filled the cache
+                        content = self._cached_response(key)
+                        if content is None:
+                            response = await self.ai_client.chat.completions.create(
+                                model=self._model,
+                                messages=[
+                                    self.SYSTEM_MSG,
+                                    {"role": "user", "content": rag_result["prompt"]}, 
+                                ],
+                                temperature=temperature,
+                                max_tokens=1000,
+                                top_p=0.95,
+                                frequency_penalty=0,
+                                presence_penalty=0
+                            )
+                            content = response.choices[0].message.content
+                            self._store_response(key, content)
+                finally:
+                    if self._inflight.get(key) is lock:
+                        del self._inflight[key]
+
+            return {
+                "query": rag_result["query"],
+                "response": content,
+                "context": rag_result["context"],
+                "sources": [doc["title"] for doc in rag_result["retrieved_docs"]]
+            }
+        
+        except Exception as e:
+            raise Exception(f"Failed to generate LLM response: {str(e)}")
+
+    @staticmethod
+    def _cache_key(model: str, system: str, prompt: str, temperature: float) -> bytes:
+        """Hash the parameters that determine a completion into a compact cache key."""
+        return blake2b(
+            f"{model}|{system}|{prompt}|{temperature}".encode(), digest_size=16
+        ).digest()
+
+    def _cached_response(self, key: bytes):
+        """Return the cached response text for key, marking it most recently used."""
+        content = self._response_cache.get(key)
+        if content is not None:
+            self._response_cache.move_to_end(key)
+        return content
+
+    def _store_response(self, key: bytes, content: str) -> None:
+        """Cache a response text, evicting the least recently used entry when full."""
+        self._response_cache[key] = content
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    async def stream_response(self, rag_result: Dict) -> AsyncIterator[Dict]:
+        """Stream a RAG-enhanced response from Azure OpenAI as it is generated.
+        
+        Same request as generate_response, but tokens are yielded as soon as they
+        arrive so callers can render incrementally or stop early.
+        
+        Args:
+            rag_result: Dictionary with the same keys as for generate_response
+                
+        Yields:
+            Dictionaries with a "delta" key holding the next chunk of response
+            text, followed by one final dictionary containing:
+                - query: Original query
+                - response: Full generated response text
+                - context: Context used for generation
+                - sources: List of source document titles
+                
+        Raises:
+            Exception: If LLM response generation fails
+        """
+        try:
+            sources = list(map(itemgetter("title"), rag_result["retrieved_docs"]))
+            stream = await self.ai_client.chat.completions.create(
+                model=self._model,
                 messages=[
-                    {"role": "system", "content": "You are a regulatory compliance expert."},
+                    self.SYSTEM_MSG,
                     {"role": "user", "content": rag_result["prompt"]}, 
                 ],
                 temperature=0.7,
                 max_tokens=1000,
                 top_p=0.95,
                 frequency_penalty=0,
-                presence_penalty=0
+                presence_penalty=0,
+                stream=True
             )
 
-            return {
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    parts.append(delta)
+                    yield {"delta": delta}
+
+            yield {
                 "query": rag_result["query"],
-                "response": response.choices[0].message.content,
+                "response": "".join(parts),
                 "context": rag_result["context"],
-                "sources": [doc["title"] for doc in rag_result["retrieved_docs"]]
+                "sources": sources
             }
         
         except Exception as e:
-            raise Exception(f"Failed to generate LLM response: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to stream LLM response: {str(e)}")
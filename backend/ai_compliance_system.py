@@ -8,6 +8,7 @@ Core Components:
 - PersonaProfile: Dataclass for AI expert persona configuration
 - AIModelManager: Manages multiple AI models and tokenizers
 - AIPersona: Implements Algorithm of Thought workflow using expert personas
+- AoTState: Stages of the Algorithm of Thought workflow
 - AoTStateMachine: State machine for Algorithm of Thought execution
 - ComplianceAI: Parallel AI system for compliance verification
 - ComplianceSystem: High-level compliance validation and analysis
@@ -37,16 +38,23 @@ Example:
 """
 
 from typing import Dict, List, Optional, Union
-from enum import Enum
+from enum import Enum, IntEnum
+from collections import ChainMap, OrderedDict
+from functools import partial
+from hashlib import blake2b
+import asyncio
+import copy
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, pipeline
 import openai
-from datetime import datetime
+from datetime import datetime, timezone
+import time
 import yaml
 import queue
 import logging
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from micro_batching import MicroBatcher
 
 class ModelType(Enum):
     LLAMA = "llama"
@@ -65,12 +73,23 @@ class PersonaProfile:
     decision_heuristics: Dict[str, str]
 
 class AIModelManager:
+    PARSE_CACHE_SIZE = 4096
+
     def __init__(self, config: Dict):
         self.models = {}
         self.tokenizers = {}
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # Micro-batching: one batcher per model, created on first submit
+        batching = config.get("batching", {})
+        self.max_batch = batching.get("max_batch", 16)
+        self.max_wait_ms = batching.get("max_wait_ms", 5)
+        self._batchers: Dict[ModelType, MicroBatcher] = {}
+        
+        # Parsed query results keyed by query hash, in LRU order
+        self._parse_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        
         # Initialize different models based on configuration
         self._initialize_models()
         
@@ -79,12 +98,31 @@ class AIModelManager:
         try:
             # Initialize LLaMA as foundation model
             if "llama" in self.config:
+                llama_config = self.config["llama"]
+                # SDPA dispatches attention to PyTorch's fused flash/memory-efficient kernels
                 self.models[ModelType.LLAMA] = AutoModelForCausalLM.from_pretrained(
-                    self.config["llama"]["model_path"]
-                )
-                self.tokenizers[ModelType.LLAMA] = AutoTokenizer.from_pretrained(
-                    self.config["llama"]["model_path"]
+                    llama_config["model_path"],
+                    attn_implementation=llama_config.get("attn_implementation", "sdpa"),
+                    **self._quantization_kwargs(llama_config)
+                ).eval()
+                tokenizer = AutoTokenizer.from_pretrained(
+                    llama_config["model_path"],
+                    padding_side="right"
                 )
+                if tokenizer.pad_token is None:
+                    tokenizer.pad_token = tokenizer.eos_token
+                self.tokenizers[ModelType.LLAMA] = tokenizer
+                
+                # Opt-in: compiling bitsandbytes-quantized layers is not reliably
+                # supported, and "reduce-overhead" CUDA graphs reuse output buffers
+                if llama_config.get("compile", False):
+                    self.models[ModelType.LLAMA] = torch.compile(
+                        self.models[ModelType.LLAMA],
+                        mode=llama_config.get("compile_mode", "default"),
+                        dynamic=True
+                    )
+                    # Pay compilation at startup rather than on the first user query
+                    self.run_batch(ModelType.LLAMA, ["warmup"])
             
             # Initialize GPT-4 client
             if "gpt4" in self.config:
@@ -92,21 +130,125 @@ class AIModelManager:
             
             # Initialize BERT for document processing
             if "bert" in self.config:
+                on_gpu = torch.cuda.is_available()
                 self.models[ModelType.BERT] = pipeline(
                     "document-classification",
-                    model=self.config["bert"]["model_path"]
+                    model=self.config["bert"]["model_path"],
+                    torch_dtype=torch.float16 if on_gpu else torch.float32,
+                    device=0 if on_gpu else -1
                 )
+                # Opt-in like LLaMA: the first call after compiling pays the whole
+                # compilation stall, which would otherwise land on a user request
+                if self.config["bert"].get("compile", False):
+                    bert = self.models[ModelType.BERT]
+                    bert.model = torch.compile(bert.model, dynamic=True)
                 
         except Exception as e:
             self.logger.error(f"Error initializing models: {str(e)}")
             raise
 
+    @staticmethod
+    def _quantization_kwargs(model_config: Dict) -> Dict:
+        """
+        Build from_pretrained arguments for the configured weight precision.
+        
+        "int8" and "int4" load bitsandbytes weight-only quantized layers (CUDA
+        only); anything else loads bfloat16 weights on GPU and float32 on CPU.
+        Defaults to "int8" when a GPU is available.
+        """
+        on_gpu = torch.cuda.is_available()
+        quantization = model_config.get("quantization", "int8" if on_gpu else None)
+        
+        if quantization == "int8":
+            return {
+                "quantization_config": BitsAndBytesConfig(load_in_8bit=True),
+                "device_map": "auto"
+            }
+        if quantization == "int4":
+            return {
+                "quantization_config": BitsAndBytesConfig(
+                    load_in_4bit=True,
+                    bnb_4bit_quant_type="nf4",
+                    bnb_4bit_compute_dtype=torch.bfloat16
+                ),
+                "device_map": "auto"
+            }
+        return {"torch_dtype": torch.bfloat16 if on_gpu else torch.float32}
+
+    def run_batch(self, model_type: ModelType, texts: List[str]) -> List:
+        """
+        Run several texts through a model in one padded forward pass.
+        
+        Returns one output per text, trimmed to that text's own tokens. Logits
+        are copied out of the batch so they stay valid after the next call.
+        """
+        model = self.models[model_type]
+        tokenizer = self.tokenizers[model_type]
+        
+        inputs = tokenizer(texts, return_tensors="pt", padding=True).to(model.device)
+        with torch.inference_mode():
+            outputs = model(**inputs, use_cache=False)
+        
+        lengths = inputs["attention_mask"].sum(dim=1).tolist()
+        return [
+            type(outputs)(logits=outputs.logits[i:i + 1, :length].clone())
+            for i, length in enumerate(lengths)
+        ]
+
+    def get_parsed(self, query: str) -> Optional[Dict]:
+        """
+        Return a copy of the cached parse of a query, or None if not cached.
+        """
+        key = blake2b(query.encode(), digest_size=16).digest()
+        parsed = self._parse_cache.get(key)
+        if parsed is None:
+            return None
+        self._parse_cache.move_to_end(key)
+        return copy.deepcopy(parsed)
+
+    def cache_parsed(self, query: str, parsed: Dict):
+        """
+        Cache the parse of a query, evicting the least recently used entry when full.
+        """
+        key = blake2b(query.encode(), digest_size=16).digest()
+        self._parse_cache[key] = copy.deepcopy(parsed)
+        self._parse_cache.move_to_end(key)
+        if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+
+    def submit(self, model_type: ModelType, text: str) -> asyncio.Future:
+        """
+        Queue a text for the next batched forward pass of a model.
+        
+        Concurrent callers are grouped into one run_batch call; await the
+        returned future for this text's output.
+        """
+        batcher = self._batchers.get(model_type)
+        if batcher is None:
+            batcher = MicroBatcher(
+                partial(self.run_batch, model_type),
+                max_batch=self.max_batch,
+                max_wait_ms=self.max_wait_ms,
+                logger=self.logger
+            )
+            self._batchers[model_type] = batcher
+        return batcher.submit(text)
+
 class AIPersona:
     def __init__(self, profile: PersonaProfile, model_manager: AIModelManager):
         self.profile = profile
         self.model_manager = model_manager
         self.state_machine = AoTStateMachine()
         self.logger = logging.getLogger(__name__)
+        
+        # Stage handlers indexed by state; each takes (query, user_context, data)
+        self._handlers = {
+            AoTState.QUERY_PARSING: lambda query, user_context, data: self._prepare_query(query, user_context),
+            AoTState.GAP_ANALYSIS: lambda query, user_context, data: self._analyze_gaps(data),
+            AoTState.EXPERT_REASONING: lambda query, user_context, data: self._apply_expert_reasoning(data),
+            AoTState.COMPLIANCE_CHECK: lambda query, user_context, data: self._verify_compliance(data),
+            AoTState.RESPONSE_GENERATION: lambda query, user_context, data: self._generate_response(data)
+        }
 
     async def process_query(self, query: str, user_context: Dict) -> Dict:
         """
@@ -118,61 +260,36 @@ class AIPersona:
             
             # Execute AoT workflow
             while not self.state_machine.is_complete():
-                current_state = self.state_machine.current_state
-                
-                if current_state == "QUERY_PARSING":
-                    parsed_query = await self._parse_query(query)
-                    self.state_machine.transition("CONTEXTUALIZATION", parsed_query)
-                    
-                elif current_state == "CONTEXTUALIZATION":
-                    context = await self._contextualize_query(
-                        self.state_machine.data,
-                        user_context
-                    )
-                    self.state_machine.transition("DATA_RETRIEVAL", context)
-                    
-                elif current_state == "DATA_RETRIEVAL":
-                    retrieved_data = await self._retrieve_data(
-                        self.state_machine.data
-                    )
-                    self.state_machine.transition("GAP_ANALYSIS", retrieved_data)
-                    
-                elif current_state == "GAP_ANALYSIS":
-                    gaps = await self._analyze_gaps(self.state_machine.data)
-                    self.state_machine.transition("EXPERT_REASONING", gaps)
-                    
-                elif current_state == "EXPERT_REASONING":
-                    reasoning = await self._apply_expert_reasoning(
-                        self.state_machine.data
-                    )
-                    self.state_machine.transition("COMPLIANCE_CHECK", reasoning)
-                    
-                elif current_state == "COMPLIANCE_CHECK":
-                    compliance_result = await self._verify_compliance(
-                        self.state_machine.data
-                    )
-                    self.state_machine.transition("RESPONSE_GENERATION", compliance_result)
-                    
-                elif current_state == "RESPONSE_GENERATION":
-                    final_response = await self._generate_response(
-                        self.state_machine.data
-                    )
-                    self.state_machine.transition("COMPLETE", final_response)
+                handler = self._handlers[self.state_machine.current_state]
+                result = await handler(query, user_context, self.state_machine.data)
+                self.state_machine.advance(result)
 
-            return self.state_machine.data
+            return dict(self.state_machine.data)
 
         except Exception as e:
             self.logger.error(f"Error processing query: {str(e)}")
             raise
 
+    async def _prepare_query(self, query: str, user_context: Dict) -> Dict:
+        """
+        Parse, contextualize and retrieve data for a query as a single stage.
+        
+        Contextualization needs no model call, so it runs inline between the
+        parse and the retrieval instead of as its own scheduled stage.
+        """
+        parsed_data = await self._parse_query(query)
+        data = dict(parsed_data)
+        data.update(self._contextualize_query(parsed_data, user_context))
+        data.update(await self._retrieve_data(data))
+        return data
+
     async def _parse_query(self, query: str) -> Dict:
         """Parse and understand the input query."""
-        model = self.model_manager.models[ModelType.LLAMA]
-        tokenizer = self.model_manager.tokenizers[ModelType.LLAMA]
+        cached = self.model_manager.get_parsed(query)
+        if cached is not None:
+            return cached
         
-        # Tokenize and process query
-        inputs = tokenizer(query, return_tensors="pt", padding=True)
-        outputs = model(**inputs)
+        outputs = await self.model_manager.submit(ModelType.LLAMA, query)
         
         # Extract key elements from the query
         parsed_data = {
@@ -181,9 +298,10 @@ class AIPersona:
             "domain_context": self._identify_domain(outputs)
         }
         
+        self.model_manager.cache_parsed(query, parsed_data)
         return parsed_data
 
-    async def _contextualize_query(self, parsed_data: Dict, user_context: Dict) -> Dict:
+    def _contextualize_query(self, parsed_data: Dict, user_context: Dict) -> Dict:
         """Add contextual information based on persona and user context."""
         context = {
             "persona_context": {
@@ -197,46 +315,55 @@ class AIPersona:
         
         return context
 
+class AoTState(IntEnum):
+    # Covers parsing, contextualization and data retrieval
+    QUERY_PARSING = 0
+    GAP_ANALYSIS = 1
+    EXPERT_REASONING = 2
+    COMPLIANCE_CHECK = 3
+    RESPONSE_GENERATION = 4
+    COMPLETE = 5
+
 class AoTStateMachine:
     """
     Implements the Algorithm of Thought state machine.
     """
+    # Successor of every non-terminal state
+    NEXT_STATE = {
+        state: AoTState(state + 1) for state in AoTState if state is not AoTState.COMPLETE
+    }
+
     def __init__(self):
-        self.states = [
-            "QUERY_PARSING",
-            "CONTEXTUALIZATION",
-            "DATA_RETRIEVAL",
-            "GAP_ANALYSIS",
-            "EXPERT_REASONING",
-            "COMPLIANCE_CHECK",
-            "RESPONSE_GENERATION",
-            "COMPLETE"
-        ]
-        self.current_state = "QUERY_PARSING"
-        self.data = {}
+        self.current_state = AoTState.QUERY_PARSING
+        # One layer per stage, newest first, so later stages shadow earlier keys
+        self.data = ChainMap()
         
-    def transition(self, new_state: str, data: Dict):
+    def transition(self, new_state: AoTState, data: Dict):
         """
         Transition to a new state with updated data.
         """
-        if new_state not in self.states:
-            raise ValueError(f"Invalid state: {new_state}")
-            
-        self.current_state = new_state
-        self.data.update(data)
+        self.current_state = AoTState(new_state)
+        self.data = self.data.new_child(data)
+
+    def advance(self, data: Dict):
+        """
+        Transition to the successor of the current state with updated data.
+        """
+        self.current_state = self.NEXT_STATE[self.current_state]
+        self.data = self.data.new_child(data)
         
     def is_complete(self) -> bool:
         """
         Check if the workflow is complete.
         """
-        return self.current_state == "COMPLETE"
+        return self.current_state is AoTState.COMPLETE
         
     def reset(self):
         """
         Reset the state machine.
         """
-        self.current_state = "QUERY_PARSING"
-        self.data = {}
+        self.current_state = AoTState.QUERY_PARSING
+        self.data = ChainMap()
 
 class ComplianceAI:
     """
@@ -251,22 +378,16 @@ class ComplianceAI:
         Verify the primary AI's output for compliance and ethical considerations.
         """
         try:
+            started_ns = time.time_ns()
+            
             # Cross-reference with authoritative sources
             verification_results = await self._cross_reference(primary_output)
             
-            # Check regulatory compliance
-            compliance_check = await self._check_compliance(
-                verification_results,
-                context
-            )
-            
-            # Detect potential biases
-            bias_analysis = await self._analyze_bias(verification_results)
-            
-            # Perform ethical assessment
-            ethical_assessment = await self._assess_ethics(
-                verification_results,
-                context
+            # Compliance, bias and ethics checks only depend on the cross-reference
+            compliance_check, bias_analysis, ethical_assessment = await asyncio.gather(
+                self._check_compliance(verification_results, context),
+                self._analyze_bias(verification_results),
+                self._assess_ethics(verification_results, context)
             )
             
             return {
@@ -278,7 +399,7 @@ class ComplianceAI:
                 "compliance_details": compliance_check,
                 "bias_analysis": bias_analysis,
                 "ethical_assessment": ethical_assessment,
-                "timestamp": datetime.now(datetime.UTC).isoformat()
+                "timestamp": datetime.fromtimestamp(started_ns / 1e9, timezone.utc).isoformat()
             }
             
         except Exception as e:
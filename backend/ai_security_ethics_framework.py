@@ -5,6 +5,8 @@ This module provides comprehensive security, privacy and ethical controls for AI
 
 Components:
 - SecurityContext: Stores user security context including roles, permissions and session info
+- Explanations: Human-readable explanation of an AI decision
+- EthicalAssessment: Result of an ethics evaluation
 - SecurityFramework: Handles authentication, authorization and access control
 - PrivacyFramework: Implements differential privacy and data protection mechanisms
 - FederatedLearningManager: Manages distributed model training across clients
@@ -40,20 +42,62 @@ Example:
         assessment = await ethics.evaluate_ethics(protected, context)
 """
 
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field
 import logging
 from datetime import datetime
 import numpy as np
-from cryptography.fernet import Fernet
+import orjson
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from numba import njit, prange
 import jwt
-from azure.identity import DefaultAzureCredential
-from azure.keyvault.keys import KeyClient
-from azure.keyvault.keys.crypto import CryptographyClient
+from azure.identity.aio import DefaultAzureCredential
+from azure.keyvault.keys.aio import KeyClient
+from azure.keyvault.keys.crypto.aio import CryptographyClient
 import tensorflow_federated as tff
 import tensorflow_privacy
 from mp_spdz.runtime import Runtime
 import tensorflow as tf
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _laplace_add(data: np.ndarray, scale: float, out: np.ndarray) -> None:
+    """Write data plus Laplace(0, scale) noise into out in one parallel pass"""
+    for i in prange(data.shape[0]):
+        out[i] = data[i] + np.random.laplace(0.0, scale)
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _gaussian_add(data: np.ndarray, sigma: float, out: np.ndarray) -> None:
+    """Write data plus N(0, sigma^2) noise into out in one parallel pass"""
+    for i in prange(data.shape[0]):
+        out[i] = data[i] + np.random.normal(0.0, sigma)
+
+# Parallel kernels must not be launched from several threads at once under
+# Numba's default workqueue threading layer, which aborts the process; every
+# launch, including warm-up, holds this lock
+_NOISE_KERNELS_LOCK = threading.Lock()
+_noise_kernels_warm = False
+
+def _warm_noise_kernels() -> None:
+    """Compile (or load from cache) the noise kernels once per process, on the calling thread"""
+    global _noise_kernels_warm
+    with _NOISE_KERNELS_LOCK:
+        if _noise_kernels_warm:
+            return
+        for dtype in (np.float32, np.float64):
+            sample = np.zeros(1, dtype=dtype)
+            _laplace_add(sample, 1.0, np.empty_like(sample))
+            _gaussian_add(sample, 1.0, np.empty_like(sample))
+        _noise_kernels_warm = True
+
+def _as_noise_input(data: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Flat contiguous view of vector data; lists and non-float arrays become float32"""
+    if isinstance(data, np.ndarray) and data.dtype in (np.float32, np.float64):
+        return np.ascontiguousarray(data).reshape(-1)
+    return np.asarray(data, dtype=np.float32).reshape(-1)
+
 @dataclass
 class SecurityContext:
     user_id: str
@@ -63,8 +107,36 @@ class SecurityContext:
     security_clearance: int
     session_id: str
     last_verified: datetime
+    # Process-local time.monotonic() of the last verification, used for the
+    # reverification interval; not meaningful outside this process, so contexts
+    # restored elsewhere start at -inf and are reverified on first use
+    _verified_at: float = field(default=float("-inf"), repr=False, compare=False)
+
+    def mark_verified(self) -> None:
+        """Record a successful verification on the wall and monotonic clocks"""
+        self.last_verified = datetime.now()
+        self._verified_at = time.monotonic()
+
+@dataclass(slots=True)
+class Explanations:
+    decision_path: Any
+    key_factors: Any
+    counterfactuals: Any
+    confidence_explanation: Any
+
+@dataclass(slots=True)
+class EthicalAssessment:
+    bias_detected: bool
+    fairness_score: float
+    confidence_score: float
+    explanations: Explanations
+    requires_escalation: bool
 
 class SecurityFramework:
+    # Directory lookups per user are reused for the continuous-verification window
+    PROFILE_CACHE_SIZE = 10000
+    PROFILE_CACHE_TTL = 300.0
+
     def __init__(self, config: Dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -73,6 +145,10 @@ class SecurityFramework:
             vault_url=config["keyvault_url"],
             credential=self.credential
         )
+        # user_id -> (expiry, (roles, attributes, permissions, clearance)), in LRU order
+        self._profile_cache: OrderedDict = OrderedDict()
+        # (frozenset(roles), resource, action) -> (expiry, allowed), in LRU order
+        self._rbac_cache: OrderedDict = OrderedDict()
 
     async def authenticate_user(self, credentials: Dict) -> SecurityContext:
         """
@@ -82,16 +158,19 @@ class SecurityFramework:
             # Verify credentials with Azure AD
             token = await self._verify_azure_ad_token(credentials["access_token"])
             
+            roles, attributes, permissions, clearance = await self._get_user_profile(token["sub"])
+            
             # Create security context
             context = SecurityContext(
                 user_id=token["sub"],
-                roles=await self._get_user_roles(token["sub"]),
-                attributes=await self._get_user_attributes(token["sub"]),
-                permissions=await self._get_user_permissions(token["sub"]),
-                security_clearance=await self._get_security_clearance(token["sub"]),
+                roles=roles,
+                attributes=attributes,
+                permissions=permissions,
+                security_clearance=clearance,
                 session_id=credentials["session_id"],
                 last_verified=datetime.now()
             )
+            context.mark_verified()
             
             return context
 
@@ -99,6 +178,53 @@ class SecurityFramework:
             self.logger.error(f"Authentication failed: {str(e)}")
             raise
 
+    async def _get_user_profile(self, user_id: str) -> tuple:
+        """
+        Fetch roles, attributes, permissions and clearance for a user.
+        
+        The four directory lookups run concurrently; results are cached per
+        user for PROFILE_CACHE_TTL seconds.
+        """
+        now = time.monotonic()
+        cached = self._profile_cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            self._profile_cache.move_to_end(user_id)
+            return cached[1]
+        
+        profile = tuple(await asyncio.gather(
+            self._get_user_roles(user_id),
+            self._get_user_attributes(user_id),
+            self._get_user_permissions(user_id),
+            self._get_security_clearance(user_id)
+        ))
+        
+        self._profile_cache[user_id] = (now + self.PROFILE_CACHE_TTL, profile)
+        self._profile_cache.move_to_end(user_id)
+        if len(self._profile_cache) > self.PROFILE_CACHE_SIZE:
+            self._profile_cache.popitem(last=False)
+        return profile
+
+    async def _check_rbac_cached(self, roles: List[str], resource: str, action: str) -> bool:
+        """
+        RBAC decision memoized on the role set, resource and action.
+        
+        RBAC depends only on roles, so users sharing a role set share one policy
+        lookup per PROFILE_CACHE_TTL seconds.
+        """
+        key = (frozenset(roles), resource, action)
+        now = time.monotonic()
+        cached = self._rbac_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._rbac_cache.move_to_end(key)
+            return cached[1]
+        
+        allowed = await self._check_rbac(roles, resource, action)
+        self._rbac_cache[key] = (now + self.PROFILE_CACHE_TTL, allowed)
+        self._rbac_cache.move_to_end(key)
+        if len(self._rbac_cache) > self.PROFILE_CACHE_SIZE:
+            self._rbac_cache.popitem(last=False)
+        return allowed
+
     async def authorize_access(self, 
                              context: SecurityContext, 
                              resource: str, 
@@ -108,11 +234,12 @@ class SecurityFramework:
         """
         try:
             # Continuous verification
-            if (datetime.now() - context.last_verified).seconds > 300:  # 5 minutes
+            if time.monotonic() - context._verified_at > 300.0:  # 5 minutes
                 await self._verify_context(context)
+                context.mark_verified()
             
             # Check RBAC permissions
-            if not await self._check_rbac(context.roles, resource, action):
+            if not await self._check_rbac_cached(context.roles, resource, action):
                 return False
             
             # Check ABAC conditions
@@ -136,17 +263,23 @@ class PrivacyFramework:
         
         # Initialize differential privacy parameters
         self.privacy_budgets = config["privacy_budgets"]
+        self._rng = np.random.default_rng()
+        # JIT the noise kernels before the first query rather than on it
+        _warm_noise_kernels()
         self.noise_mechanisms = {
             "laplace": self._add_laplace_noise,
             "gaussian": self._add_gaussian_noise
         }
 
     async def apply_differential_privacy(self, 
-                                       query_result: Union[float, List[float]], 
+                                       query_result: Union[float, List[float], np.ndarray], 
                                        domain: str,
-                                       sensitivity: float) -> Union[float, List[float]]:
+                                       sensitivity: float) -> Union[float, List[float], np.ndarray]:
         """
         Apply differential privacy to query results.
+        
+        Vector results are noised in float32 unless given as a float64 array;
+        arrays come back as new arrays of the same shape, lists as lists.
         """
         try:
             # Get privacy budget for domain
@@ -167,17 +300,38 @@ class PrivacyFramework:
             raise
 
     def _add_laplace_noise(self, 
-                          data: Union[float, List[float]], 
+                          data: Union[float, List[float], np.ndarray], 
                           epsilon: float, 
                           delta: float, 
-                          sensitivity: float) -> Union[float, List[float]]:
+                          sensitivity: float) -> Union[float, List[float], np.ndarray]:
         """
         Add Laplace noise to data.
         """
         scale = sensitivity / epsilon
-        if isinstance(data, list):
-            return [x + np.random.laplace(0, scale) for x in data]
-        return data + np.random.laplace(0, scale)
+        if isinstance(data, (list, np.ndarray)):
+            values = _as_noise_input(data)
+            noisy = np.empty_like(values)
+            with _NOISE_KERNELS_LOCK:
+                _laplace_add(values, scale, noisy)
+            return noisy.tolist() if isinstance(data, list) else noisy.reshape(data.shape)
+        return data + self._rng.laplace(0.0, scale)
+
+    def _add_gaussian_noise(self, 
+                           data: Union[float, List[float], np.ndarray], 
+                           epsilon: float, 
+                           delta: float, 
+                           sensitivity: float) -> Union[float, List[float], np.ndarray]:
+        """
+        Add Gaussian noise to data for (epsilon, delta)-differential privacy.
+        """
+        sigma = sensitivity * np.sqrt(2 * np.log(1.25 / delta)) / epsilon
+        if isinstance(data, (list, np.ndarray)):
+            values = _as_noise_input(data)
+            noisy = np.empty_like(values)
+            with _NOISE_KERNELS_LOCK:
+                _gaussian_add(values, sigma, noisy)
+            return noisy.tolist() if isinstance(data, list) else noisy.reshape(data.shape)
+        return data + self._rng.normal(0.0, sigma)
 
 class FederatedLearningManager:
     def __init__(self, config: Dict):
@@ -225,22 +379,18 @@ class EthicalAI:
 
     async def evaluate_ethics(self, 
                             decision: Dict, 
-                            context: Dict) -> Dict:
+                            context: Dict) -> EthicalAssessment:
         """
         Evaluate AI decisions for ethical compliance.
         """
         try:
-            # Check bias metrics
-            bias_results = await self._check_bias(decision, context)
-            
-            # Evaluate fairness
-            fairness_results = await self._evaluate_fairness(decision, context)
-            
-            # Generate explanations
-            explanations = await self._generate_explanations(decision, context)
-            
-            # Calculate confidence scores
-            confidence = await self._calculate_confidence(decision, context)
+            # Bias, fairness, explanations and confidence are independent
+            bias_results, fairness_results, explanations, confidence = await asyncio.gather(
+                self._check_bias(decision, context),
+                self._evaluate_fairness(decision, context),
+                self._generate_explanations(decision, context),
+                self._calculate_confidence(decision, context)
+            )
             
             # Check escalation criteria
             should_escalate = await self._check_escalation_criteria(
@@ -249,15 +399,13 @@ class EthicalAI:
                 confidence
             )
             
-            return {
-                "ethical_assessment": {
-                    "bias_detected": bias_results["bias_detected"],
-                    "fairness_score": fairness_results["fairness_score"],
-                    "confidence_score": confidence,
-                    "explanations": explanations,
-                    "requires_escalation": should_escalate
-                }
-            }
+            return EthicalAssessment(
+                bias_detected=bias_results["bias_detected"],
+                fairness_score=fairness_results["fairness_score"],
+                confidence_score=confidence,
+                explanations=explanations,
+                requires_escalation=should_escalate
+            )
 
         except Exception as e:
             self.logger.error(f"Ethical evaluation failed: {str(e)}")
@@ -286,15 +434,26 @@ class EthicalAI:
         
         return results
 
-    async def _generate_explanations(self, decision: Dict, context: Dict) -> Dict:
+    @staticmethod
+    def to_bytes(assessment: EthicalAssessment) -> bytes:
+        """
+        Serialize an ethics assessment to JSON bytes for logging or the HTTP layer.
+        """
+        return orjson.dumps(assessment, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    async def _generate_explanations(self, decision: Dict, context: Dict) -> Explanations:
         """
         Generate human-readable explanations for AI decisions.
         """
-        explanations = {
-            "decision_path": await self._generate_decision_path(decision),
-            "key_factors": await self._identify_key_factors(decision),
-            "counterfactuals": await self._generate_counterfactuals(decision, context),
-            "confidence_explanation": await self._explain_confidence_score(decision)
-        }
-        
-        return explanations
+        decision_path, key_factors, counterfactuals, confidence_explanation = await asyncio.gather(
+            self._generate_decision_path(decision),
+            self._identify_key_factors(decision),
+            self._generate_counterfactuals(decision, context),
+            self._explain_confidence_score(decision)
+        )
+        return Explanations(
+            decision_path=decision_path,
+            key_factors=key_factors,
+            counterfactuals=counterfactuals,
+            confidence_explanation=confidence_explanation
+        )
@@ -31,6 +31,7 @@ The workflow follows these key states:
 
 Example:
     config = load_config()
+    configure_cuda_allocator(config.get("cuda_memory_fraction"))
     aot = AlgorithmOfThought(config)
     
     context = QueryContext(
@@ -49,17 +50,95 @@ Example:
     )
 """
 
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
+from collections import OrderedDict
 import asyncio
+import copy
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 import logging
+import os
 import numpy as np
 from transformers import AutoTokenizer, AutoModel
 import torch
 from backend.config import aot_config
 from space_mapper import SpaceMapper
+from micro_batching import MicroBatcher
+
+# Serializes cold loads so concurrent instances share a single copy of each model
+_MODEL_LOCK = threading.Lock()
+
+# Per-checkpoint locks serializing encodes across instances: the shared fast
+# tokenizer raises "Already borrowed" when called from two threads at once
+_ENCODE_LOCKS: Dict[str, threading.Lock] = {}
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(name: str):
+    return AutoTokenizer.from_pretrained(name)
+
+def _inference_dtype(device: str) -> torch.dtype:
+    """bfloat16 on GPUs that support it, float16 on older GPUs, float32 on CPU"""
+    if device != "cuda":
+        return torch.float32
+    return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+@lru_cache(maxsize=4)
+def _load_model(name: str, device: str, compile_model: bool):
+    model = AutoModel.from_pretrained(
+        name, torch_dtype=_inference_dtype(device)
+    ).eval().to(device)
+    if compile_model:
+        # Default mode: "reduce-overhead" CUDA graphs reuse output buffers across
+        # calls and re-record per input shape, which batched encodes vary constantly
+        model = torch.compile(model, dynamic=True)
+        # Trigger compilation now rather than on the first user query
+        inputs = _load_tokenizer(name)(["warmup"], return_tensors="pt").to(device)
+        with torch.inference_mode():
+            model(**inputs)
+    return model
+
+@lru_cache(maxsize=2)
+def _load_sentence_encoder(name: str, device: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name, device=device)
+
+def configure_cuda_allocator(memory_fraction: Optional[float] = None) -> None:
+    """
+    Apply process-wide CUDA allocator settings for a service running AoT workflows.
+    
+    Call once from the service entrypoint before the first model is loaded.
+    Expandable segments limit fragmentation from mixed-size batched encodes
+    (an existing PYTORCH_CUDA_ALLOC_CONF is kept); memory_fraction optionally
+    caps this process's share of GPU memory.
+    """
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+    if memory_fraction is not None and torch.cuda.is_available():
+        torch.cuda.set_per_process_memory_fraction(memory_fraction)
+
+def _get_encode_lock(name: str) -> threading.Lock:
+    """
+    Return the lock guarding the shared tokenizer and models of a BERT checkpoint.
+    """
+    with _MODEL_LOCK:
+        return _ENCODE_LOCKS.setdefault(name, threading.Lock())
+
+def _get_sentence_encoder(name: str, device: str):
+    """
+    Return the shared sentence encoder used for semantic cache keys, loading it once.
+    """
+    with _MODEL_LOCK:
+        return _load_sentence_encoder(name, device)
+
+def _get_bert(name: str, device: str, compile_model: bool):
+    """
+    Return the shared (tokenizer, model) pair for a BERT checkpoint, loading it once.
+    """
+    with _MODEL_LOCK:
+        return _load_tokenizer(name), _load_model(name, device, compile_model)
 
 class AIState(Enum):
     QUERY_PARSING = "query_parsing"
@@ -96,10 +175,44 @@ class AlgorithmOfThought:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.state = AIState.QUERY_PARSING
-        self.tokenizer = AutoTokenizer.from_pretrained(config["bert_model"])
-        self.model = AutoModel.from_pretrained(config["bert_model"])
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.tokenizer, self.model = _get_bert(
+            config["bert_model"],
+            self.device.type,
+            config.get("compile_bert", torch.cuda.is_available())
+        )
+        self._encode_lock = _get_encode_lock(config["bert_model"])
         self.space_mapper = SpaceMapper(config['space_mapper'])
         
+        # Micro-batching of BERT encodes across concurrent queries
+        batching = config.get("batching", {})
+        self._batcher = MicroBatcher(
+            self._encode_batch,
+            max_batch=batching.get("max_batch", 16),
+            max_wait_ms=batching.get("max_wait_ms", 5),
+            logger=self.logger
+        )
+        
+        # Semantic cache: ring buffer of normalized query embeddings and their results.
+        # Cosine similarity alone cannot tell apart queries that differ only by a
+        # negation ("... apply" vs "... not apply"), which can score above 0.95;
+        # raise the threshold or set it above 1 to disable the cache where that matters
+        self.semantic_cache_threshold = config.get("semantic_cache_threshold", 0.95)
+        self.semantic_cache_size = config.get("semantic_cache_size", 1024)
+        # Cached workflows embed regulatory retrieval and recent updates, so entries
+        # expire after semantic_cache_ttl seconds rather than only on eviction
+        self.semantic_cache_ttl = config.get("semantic_cache_ttl", 300.0)
+        self._sem_expiry = np.full(self.semantic_cache_size, -np.inf)  # time.monotonic() deadlines
+        self._sem_vectors: Optional[np.ndarray] = None  # allocated once the embedding size is known
+        self._sem_contexts: List[Optional[Tuple]] = [None] * self.semantic_cache_size
+        self._sem_results: List[Optional[Dict]] = [None] * self.semantic_cache_size
+        self._sem_count = 0
+        
+        # Nearby-regulation lookups keyed by coordinate tile and radius, in LRU order
+        self.geo_cache_size = config.get("geo_cache_size", 10000)
+        self.geo_cache_precision = config.get("geo_cache_precision", 2)
+        self._geo_cache: OrderedDict = OrderedDict()
+        
     async def process_query(self, 
                           query: str, 
                           context: QueryContext) -> Dict:
@@ -107,6 +220,16 @@ class AlgorithmOfThought:
         Execute the complete AoT workflow.
         """
         try:
+            cache_vector = await asyncio.to_thread(self._embed_for_cache, query)
+            cache_context = self._context_key(context)
+            cached = self._semantic_lookup(cache_vector, cache_context)
+            if cached is not None:
+                # The cached workflow came from a similar earlier request; report
+                # this caller's own query and context rather than that request's
+                cached["query"] = query
+                cached["context"] = context
+                return cached
+            
             workflow_data = {
                 "query": query,
                 "context": context,
@@ -131,12 +254,74 @@ class AlgorithmOfThought:
                 # Transition to next state
                 self._transition_state(result, workflow_data)
             
+            self._semantic_store(cache_vector, cache_context, workflow_data)
             return workflow_data
 
         except Exception as e:
             self.logger.error(f"Query processing failed: {str(e)}")
             raise
 
+    def _embed_for_cache(self, query: str) -> np.ndarray:
+        """
+        Embed a query with the small sentence encoder used for semantic cache lookups.
+        """
+        name = self.config.get("semantic_cache_model", "all-MiniLM-L6-v2")
+        encoder = _get_sentence_encoder(name, self.device.type)
+        # Shared across instances and called from worker threads, like the BERT tokenizer
+        with _get_encode_lock(name):
+            vector = encoder.encode(query, convert_to_numpy=True, normalize_embeddings=True)
+        return vector.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _context_key(context: QueryContext) -> Tuple:
+        """
+        Context fields a cached result must match; the timestamp is excluded.
+        """
+        return (
+            context.user_role,
+            context.expertise_level,
+            context.industry,
+            context.region,
+            context.request_priority,
+            tuple(context.coordinates)
+        )
+
+    def _semantic_lookup(self, vector: np.ndarray, context_key: Tuple) -> Optional[Dict]:
+        """
+        Return a copy of the cached result for the most similar earlier query with
+        the same context, if its cosine similarity reaches the threshold and the
+        entry has not expired.
+        
+        The copy still carries the earlier run's state_history timestamps and
+        intermediate results; process_query replaces its query and context.
+        """
+        filled = min(self._sem_count, self.semantic_cache_size)
+        if not filled:
+            return None
+        
+        scores = self._sem_vectors[:filled] @ vector
+        live = self._sem_expiry[:filled] > time.monotonic()
+        candidates = np.flatnonzero((scores >= self.semantic_cache_threshold) & live)
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            if self._sem_contexts[slot] == context_key:
+                return copy.deepcopy(self._sem_results[slot])
+        return None
+
+    def _semantic_store(self, vector: np.ndarray, context_key: Tuple, result: Dict):
+        """
+        Add a result to the semantic cache, overwriting the oldest entry when full.
+        """
+        if self._sem_vectors is None:
+            self._sem_vectors = np.zeros(
+                (self.semantic_cache_size, vector.shape[0]), dtype=np.float32
+            )
+        slot = self._sem_count % self.semantic_cache_size
+        self._sem_vectors[slot] = vector
+        self._sem_contexts[slot] = context_key
+        self._sem_results[slot] = copy.deepcopy(result)
+        self._sem_expiry[slot] = time.monotonic() + self.semantic_cache_ttl
+        self._sem_count += 1
+
     async def _execute_state(self, workflow_data: Dict) -> Dict:
         """
         Execute current state logic.
@@ -182,44 +367,83 @@ class AlgorithmOfThought:
         """
         Parse and understand the query using NLP.
         """
-        # Tokenize and encode query
-        inputs = self.tokenizer(
-            query,
-            return_tensors="pt",
-            padding=True,
-            truncation=True
-        )
-        
-        # Get BERT embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+        # Get BERT embeddings, batched with other in-flight queries
+        outputs = await self._encode(query)
         
         # Extract key elements
         return {
             "intent": await self._extract_intent(outputs),
             "keywords": await self._extract_keywords(outputs),
             "entities": await self._extract_entities(outputs),
-            "embeddings": outputs.last_hidden_state.mean(dim=1)
+            # Pool in the model's half precision, hand float32 to downstream stages
+            "embeddings": outputs.last_hidden_state.mean(dim=1).float()
         }
 
+    async def _encode(self, query: str):
+        """
+        Queue a query for the next batched BERT forward pass and await its output.
+        """
+        return await self._batcher.submit(query)
+
+    def _encode_batch(self, queries: List[str]) -> List:
+        """
+        Encode several queries in one padded BERT forward pass.
+        
+        Returns one output per query, trimmed to that query's own tokens and
+        copied out of the batch, since callers use them after the next pass.
+        Holds the checkpoint's encode lock, as other instances share the same
+        tokenizer and model from their own batcher threads.
+        """
+        with self._encode_lock:
+            inputs = self.tokenizer(
+                queries,
+                return_tensors="pt",
+                padding=True,
+                truncation=True
+            ).to(self.device)
+            
+            with torch.inference_mode():
+                outputs = self.model(**inputs)
+            
+            lengths = inputs["attention_mask"].sum(dim=1).tolist()
+            return [
+                type(outputs)(
+                    last_hidden_state=outputs.last_hidden_state[i:i + 1, :length].clone(),
+                    pooler_output=(
+                        outputs.pooler_output[i:i + 1].clone()
+                        if outputs.pooler_output is not None else None
+                    )
+                )
+                for i, length in enumerate(lengths)
+            ]
+
     async def _contextualize_query(self, parsed_query: Dict, context: QueryContext) -> Dict:
         """
         Enrich query with contextual information.
         """
+        industry_context, regional_factors = await asyncio.gather(
+            self._get_industry_context(context.industry),
+            self._get_regional_factors(context.region)
+        )
+        
         # Extract relevant context features
         context_features = {
             "user_expertise": self._normalize_expertise(context.expertise_level),
-            "industry_context": await self._get_industry_context(context.industry),
-            "regional_factors": await self._get_regional_factors(context.region),
+            "industry_context": industry_context,
+            "regional_factors": regional_factors,
             "temporal_context": self._get_temporal_context(context.timestamp),
             "priority_level": self._normalize_priority(context.request_priority)
         }
 
-        # Combine query embeddings with context
-        enriched_embeddings = torch.cat([
-            parsed_query["embeddings"],
-            torch.tensor(list(context_features.values())).unsqueeze(0)
-        ], dim=1)
+        # Combine query embeddings with context; the feature row is built directly
+        # on the embeddings' device and dtype, so no CPU tensor or host copy is needed
+        embeddings = parsed_query["embeddings"]
+        context_tensor = torch.tensor(
+            [list(context_features.values())],
+            dtype=embeddings.dtype,
+            device=embeddings.device
+        )
+        enriched_embeddings = torch.cat([embeddings, context_tensor], dim=1)
 
         return {
             "original_query": parsed_query,
@@ -245,12 +469,18 @@ class AlgorithmOfThought:
             "time_relevance": contextualized_query["context_features"]["temporal_context"]
         }
 
-        # Perform multi-source retrieval
+        # Perform multi-source retrieval; the sources are independent
+        regulatory_docs, precedent_cases, expert_knowledge, recent_updates = await asyncio.gather(
+            self._search_regulatory_database(search_params),
+            self._search_case_database(search_params),
+            self._search_knowledge_base(search_params),
+            self._get_recent_updates(search_params)
+        )
         retrieved_data = {
-            "regulatory_docs": await self._search_regulatory_database(search_params),
-            "precedent_cases": await self._search_case_database(search_params),
-            "expert_knowledge": await self._search_knowledge_base(search_params),
-            "recent_updates": await self._get_recent_updates(search_params)
+            "regulatory_docs": regulatory_docs,
+            "precedent_cases": precedent_cases,
+            "expert_knowledge": expert_knowledge,
+            "recent_updates": recent_updates
         }
 
         # Score and rank results
@@ -267,20 +497,18 @@ class AlgorithmOfThought:
         """
         Analyze gaps in retrieved data.
         """
-        # Identify coverage gaps
-        coverage_analysis = await self._analyze_coverage(
-            retrieved_data["retrieved_data"],
-            retrieved_data["search_params"]
-        )
-
-        # Identify temporal gaps
-        temporal_gaps = await self._analyze_temporal_coverage(
-            retrieved_data["retrieved_data"]
-        )
-
-        # Analyze confidence levels
-        confidence_analysis = await self._analyze_confidence_levels(
-            retrieved_data["scored_results"]
+        # Coverage, temporal and confidence gaps are analyzed independently
+        coverage_analysis, temporal_gaps, confidence_analysis = await asyncio.gather(
+            self._analyze_coverage(
+                retrieved_data["retrieved_data"],
+                retrieved_data["search_params"]
+            ),
+            self._analyze_temporal_coverage(
+                retrieved_data["retrieved_data"]
+            ),
+            self._analyze_confidence_levels(
+                retrieved_data["scored_results"]
+            )
         )
 
         # Generate gap mitigation strategies
@@ -306,16 +534,16 @@ class AlgorithmOfThought:
         """
         Apply expert reasoning using relevant regulations.
         """
-        relevant_regulations = self.space_mapper.get_nearby_regulations(
+        relevant_regulations = self._nearby_regulations(
             context.coordinates,
-            radius=self.config['contextual_radius']
+            self.config['contextual_radius']
         )
 
-        reasoning_details = []
-        for regulation in relevant_regulations:
-            # Placeholder for actual reasoning logic
-            reasoning_detail = f"Regulation {regulation['id']} applied with context {context.region} and industry {context.industry}."
-            reasoning_details.append(reasoning_detail)
+        # Placeholder for actual reasoning logic; only the regulation id varies per line
+        suffix = f" applied with context {context.region} and industry {context.industry}."
+        reasoning_details = [
+            f"Regulation {regulation['id']}{suffix}" for regulation in relevant_regulations
+        ]
 
         reasoning_result = {
             "primary_regulation_id": relevant_regulations[0]['id'] if relevant_regulations else "N/A",
@@ -324,6 +552,28 @@ class AlgorithmOfThought:
 
         return reasoning_result
 
+    def _nearby_regulations(self, coordinates: List[float], radius: float) -> List[Dict]:
+        """
+        Regulations near a location, cached per coordinate tile and radius.
+        
+        SpaceMapper is queried with the exact coordinates; the tile (coordinates
+        rounded to geo_cache_precision decimals, in SpaceMapper's own embedding
+        units) only keys the cache, so later queries in the same tile reuse the
+        first one's result. Returns a copy, safe for the caller to modify.
+        """
+        tile = tuple(round(c, self.geo_cache_precision) for c in coordinates)
+        key = (tile, radius)
+        regulations = self._geo_cache.get(key)
+        if regulations is not None:
+            self._geo_cache.move_to_end(key)
+            return list(regulations)
+        
+        regulations = self.space_mapper.get_nearby_regulations(coordinates, radius=radius)
+        self._geo_cache[key] = regulations
+        if len(self._geo_cache) > self.geo_cache_size:
+            self._geo_cache.popitem(last=False)
+        return list(regulations)
+
     async def _generate_response(self, workflow_data: Dict) -> Dict:
         """
         Generate final response incorporating related regulations.
@@ -364,6 +614,13 @@ class PersonaManager:
                 version=persona_config["version"]
             )
             self.personas[persona.role] = persona
+        
+        # Persona score = component scores (in this order) dotted with the weights
+        weights = self.config["persona_selection_weights"]
+        self._weight_vec = np.array(
+            [weights[k] for k in ("domain", "expertise", "certifications", "training", "rules")],
+            dtype=np.float64
+        )
 
     async def select_persona(self, 
                            query_context: Dict,
@@ -372,30 +629,31 @@ class PersonaManager:
         Select appropriate persona based on context.
         """
         try:
-            # Calculate persona scores
-            scores = {}
-            for role, persona in self.personas.items():
-                score = await self._calculate_persona_score(
+            # Score components for all personas, one row per persona
+            components = np.stack([
+                self._calculate_persona_score(
                     persona,
                     query_context,
                     analysis_requirements
                 )
-                scores[role] = score
+                for persona in self.personas.values()
+            ])
+            scores = components @ self._weight_vec
             
             # Select highest scoring persona
-            selected_role = max(scores.items(), key=lambda x: x[1])[0]
+            selected_role = list(self.personas)[int(scores.argmax())]
             return self.personas[selected_role]
 
         except Exception as e:
             self.logger.error(f"Persona selection failed: {str(e)}")
             raise
 
-    async def _calculate_persona_score(self, 
-                                     persona: AIPersona,
-                                     query_context: Dict,
-                                     analysis_requirements: Dict) -> float:
+    def _calculate_persona_score(self, 
+                               persona: AIPersona,
+                               query_context: Dict,
+                               analysis_requirements: Dict) -> np.ndarray:
         """
-        Calculate suitability score for a persona.
+        Calculate the weighted suitability components for a persona.
         """
         # Calculate domain relevance
         domain_score = self._calculate_domain_match(
@@ -429,18 +687,12 @@ class PersonaManager:
             analysis_requirements["decision_context"]
         )
 
-        # Weighted combination of scores
-        weights = self.config["persona_selection_weights"]
-        total_score = (
-            weights["domain"] * domain_score +
-            weights["expertise"] * expertise_score +
-            weights["certifications"] * cert_score +
-            weights["training"] * training_score +
-            weights["rules"] * rule_score
+        # Weighting is applied to all personas at once in select_persona
+        return np.array(
+            [domain_score, expertise_score, cert_score, training_score, rule_score],
+            dtype=np.float64
         )
 
-        return total_score
-
 class ComplianceVerifier:
     def __init__(self, config: Dict):
         self.config = config
@@ -491,6 +743,7 @@ class ComplianceVerifier:
 # Example usage
 async def main():
     config = aot_config()
+    configure_cuda_allocator(config.get("cuda_memory_fraction"))
     aot = AlgorithmOfThought(config)
     
     context = QueryContext(
@@ -0,0 +1,90 @@
+"""
+Micro-batching of model calls across concurrent asyncio callers.
+
+Texts submitted within a short window are grouped, bucketed by length so
+short texts are not padded to the longest one, and run through a synchronous
+batch function in a worker thread.
+
+Example:
+    batcher = MicroBatcher(encode_texts, max_batch=16, max_wait_ms=5)
+    output = await batcher.submit("Analyze regulatory requirements")
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+from collections import defaultdict
+import asyncio
+import logging
+
+class MicroBatcher:
+    """
+    Groups concurrent single-text requests into batched calls of run_batch.
+
+    Attributes:
+        run_batch: Synchronous function returning one output per input text
+        max_batch: Maximum number of texts per batch
+        max_wait_ms: Longest a batch waits for more texts after its first arrival
+    """
+
+    def __init__(self,
+                 run_batch: Callable[[List[str]], List[Any]],
+                 max_batch: int = 16,
+                 max_wait_ms: float = 5,
+                 logger: Optional[logging.Logger] = None):
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.logger = logger or logging.getLogger(__name__)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, text: str) -> asyncio.Future:
+        """
+        Queue a text for the next batched call and return a future for its output.
+        """
+        loop = asyncio.get_running_loop()
+        # Restart the worker if it died or belongs to an earlier event loop,
+        # otherwise queued texts would never be drained
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._drain(self._queue))
+
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return future
+
+    async def _drain(self, pending: asyncio.Queue):
+        """
+        Drain queued texts into batches of up to max_batch, waiting at most
+        max_wait_ms after the first arrival.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await pending.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Bucket by length so short texts are not padded to the longest one
+            buckets = defaultdict(list)
+            for text, future in batch:
+                if not future.cancelled():
+                    buckets[len(text).bit_length()].append((text, future))
+
+            for bucket in buckets.values():
+                try:
+                    outputs = await asyncio.to_thread(self.run_batch, [text for text, _ in bucket])
+                except Exception as e:
+                    self.logger.error(f"Batched inference error: {str(e)}")
+                    for _, future in bucket:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), output in zip(bucket, outputs):
+                    if not future.done():
+                        future.set_result(output)